@@ -1,9 +1,46 @@
 import sys
 import re
+from bisect import bisect_right
+
+# Ключевые слова: написание в верхнем и нижнем регистре -> один и тот же
+# интернированный тип токена
+_KEYWORDS = frozenset({"ARRAY", "BEGIN", "ELSE", "END", "IF", "OF", "OR", "PROGRAM", "PROCEDURE", "THEN", "TYPE", "VAR"})
+_KEYWORD_TYPES = {k: sys.intern(k) for k in _KEYWORDS}
+_KEYWORD_TYPES.update({k.lower(): v for k, v in _KEYWORD_TYPES.items()})
+_KEYWORD_LENGTHS = frozenset(len(k) for k in _KEYWORDS)
+
+# Операторы и пунктуация
+_OPERATORS = {
+    ':=': 'ASSIGN', '<=': 'LESS_EQ', '<>': 'NOT_EQ', '>=': 'GREATER_EQ',
+    '*': 'MULTIPLICATION', '+': 'PLUS', '-': 'MINUS',
+    ';': 'SEMICOLON', ',': 'COMMA', '(': 'LEFT_PAREN',
+    ')': 'RIGHT_PAREN', '[': 'LEFT_BRACKET', ']': 'RIGHT_BRACKET',
+    '=': 'EQ', ':': 'COLON', '<': 'LESS', '>': 'GREATER', '.': 'DOT',
+    '/': 'DIVIDE'
+}
+
+# Общий шаблон лексера: сначала пропускаются пробелы и комментарии, затем
+# альтернативы проверяются по порядку, имя сработавшей группы — вид токена.
+# BAD — любой другой символ, EOF — конец файла после хвостовых пробелов.
+_RE_TOKEN = re.compile(r"""
+    (?:\s+|\{[^}]*\}?|//[^\n]*)*
+    (?:
+        (?P<WORD>[^\W\d]\w*)
+      | (?P<NUMBER>[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]*)?|\.[0-9]+(?:[eE][+-]?[0-9]*)?)
+      | (?P<OP>%s)
+      | (?P<STRING>'[^'\n]*'?)
+      | (?P<BAD>.)
+      | (?P<EOF>\Z)
+    )
+""" % '|'.join(re.escape(op) for op in sorted(_OPERATORS, key=len, reverse=True)), re.VERBOSE | re.DOTALL)
+_RE_NEWLINE = re.compile(r'\n')
+_RE_CYRILLIC = re.compile(r'[а-яА-Я]')
 
 # Класс для токена
 type_alias = str 
 class Token:
+    __slots__ = ('type', 'line', 'col', 'lexeme')
+
     def __init__(self, type: str, line: int, col: int, lexeme: str):
         self.type = type
         self.line = line
@@ -15,195 +52,81 @@ class Token:
 
 class Lexer:
     def __init__(self, infile: str):
-        self.infile = open(infile, 'r', encoding='utf-8')
-        self.buffer = ''
-        self.eof = False
-        self.line = 1
-        self.col = 1
-        self.keywords = {"ARRAY", "BEGIN", "ELSE", "END", "IF", "OF", "OR", "PROGRAM", "PROCEDURE", "THEN", "TYPE", "VAR"}
-
-    def close(self):
-        self.infile.close()
-
-    def read_char(self) -> str:
-        ch = self.infile.read(1)
-        if ch == '':
-            self.eof = True
-            return None
-        if ch == '\n':
-            self.line += 1
-            self.col = 1
-        else:
-            self.col += 1
-        return ch
-
-    def peek_char(self) -> str:
-        if self.buffer:
-            return self.buffer[0]
-        self.buffer = self.infile.read(1)
-        if self.buffer == '':
-            self.eof = True
-            return None
-        return self.buffer[0]
-
-    def get_char(self) -> str:
-        if self.buffer:
-            ch = self.buffer[0]
-            self.buffer = self.buffer[1:]
-            if ch == '\n':
-                self.line += 1
-                self.col = 1
-            else:
-                self.col += 1
-            return ch
-        return self.read_char()
-
-    def peek_next_is_digit(self) -> bool:
-        # Проверяет, что следующий символ (после текущего) — цифра
-        if self.buffer and len(self.buffer) > 1:
-            return self.buffer[1].isdigit()
-        pos = self.infile.tell()
-        ch = self.infile.read(1)
-        self.infile.seek(pos)
-        return ch.isdigit() if ch else False
-
-    def next_token(self) -> Token:
-        # Пропуск пробельных символов
-        while True:
-            ch = self.peek_char()
-            if ch is None:
-                return None
-            if ch.isspace():
-                self.get_char()
-                continue
-            break
-
-        start_line, start_col = self.line, self.col
-        ch = self.peek_char()
-
-        # Блочный комментарий { ... }
-        if ch == '{':
-            self.get_char()
-            while True:
-                ch = self.peek_char()
-                if ch is None or ch == '}':
-                    if ch == '}':
-                        self.get_char()
-                    break
-                self.get_char()
-            return self.next_token()
-
-        # Однострочный комментарий //...
-        if ch == '/':
-            self.get_char()
-            if self.peek_char() == '/':
-                self.get_char()
-                while True:
-                    ch = self.peek_char()
-                    if ch is None or ch == '\n':
-                        break
-                    self.get_char()
-                return self.next_token()
-            else:
-                return Token('DIVIDE', start_line, start_col, '/')
-
-        # Строковый литерал в одинарных кавычках
-        if ch == "'":
-            lex = self.get_char()
-            while True:
-                ch = self.peek_char()
-                if ch is None or ch == '\n':
-                    return Token('BAD', start_line, start_col, lex)
-                lex += self.get_char()
-                if ch == "'":
-                    break
-            return Token('STRING', start_line, start_col, lex)
-
-        # Числовые литералы (INTEGER или FLOAT)
-        if ch.isdigit() or (ch == '.' and self.peek_next_is_digit()):
-            lex = ''
-            is_float = False
-            # Целая часть
-            while True:
-                ch = self.peek_char()
-                if ch and ch.isdigit():
-                    lex += self.get_char()
+        # Исходник читается целиком, дальше сканируем по индексу
+        with open(infile, 'r', encoding='utf-8') as f:
+            self.src = f.read()
+        self.pos = 0
+        self.n = len(self.src)
+        # Начала строк: строка и столбец токена вычисляются по позиции только при выдаче;
+        # последний элемент — заглушка за концом файла
+        self.line_starts = [0] + [m.end() for m in _RE_NEWLINE.finditer(self.src)] + [self.n + 1]
+        self.stream = None
+
+    def scan(self):
+        # Генератор кортежей (тип, строка, столбец, лексема) до конца файла: один проход
+        # finditer по общему шаблону. Это самый горячий цикл, поэтому всё нужное
+        # держим в локальных переменных.
+        line_starts = self.line_starts
+        line, next_line_start = 1, line_starts[1]
+        for m in _RE_TOKEN.finditer(self.src, self.pos):
+            kind = m.lastgroup
+            start, self.pos = m.span(kind)
+            if kind == 'EOF':
+                break
+            lex = m.group(kind)
+            # Номер строки сдвигается только когда токен ушёл за начало следующей строки
+            if start >= next_line_start:
+                line = bisect_right(line_starts, start, line)
+                next_line_start = line_starts[line]
+            col = start - line_starts[line - 1] + 1
+
+            # Идентификаторы и ключевые слова
+            if kind == 'WORD':
+                # Не-ASCII слово плохое, если в нём кириллица или оно начинается не с буквы
+                if len(lex) > 256 or (not lex.isascii() and (
+                        _RE_CYRILLIC.search(lex) or not (lex[0].isalpha() or lex[0] == '_'))):
+                    kind = 'BAD'
                 else:
-                    break
-            # Дробная часть
-            if self.peek_char() == '.' and self.peek_next_is_digit():
-                is_float = True
-                lex += self.get_char()
-                while True:
-                    ch = self.peek_char()
-                    if ch and ch.isdigit():
-                        lex += self.get_char()
-                    else:
-                        break
-            # Экспонента
-            if self.peek_char() and self.peek_char().upper() == 'E':
-                is_float = True
-                lex += self.get_char()
-                if self.peek_char() in ['+', '-']:
-                    lex += self.get_char()
-                while True:
-                    ch = self.peek_char()
-                    if ch and ch.isdigit():
-                        lex += self.get_char()
-                    else:
-                        break
-            if is_float:
-                return Token('FLOAT', start_line, start_col, lex)
-            # Ограничение длины INTEGER
-            if len(lex) > 16:
-                return Token('BAD', start_line, start_col, lex)
-            return Token('INTEGER', start_line, start_col, lex)
-
-        # Идентификаторы и ключевые слова
-        if ch.isalpha() or ch == '_':
-            lex = ''
-            while True:
-                ch = self.peek_char()
-                if ch and (ch.isalnum() or ch == '_'):
-                    lex += self.get_char()
+                    # Ключевые слова в верхнем или нижнем регистре находятся без upper();
+                    # upper() нужен, только если длина совпадает с длиной какого-то ключевого
+                    # слова, а идентификатор не однорегистровый ASCII
+                    kind = _KEYWORD_TYPES.get(lex)
+                    if (kind is None and len(lex) in _KEYWORD_LENGTHS
+                            and not (lex.isascii() and (lex.islower() or lex.isupper()))):
+                        kind = _KEYWORD_TYPES.get(lex.upper())
+                    if kind is None:
+                        kind = 'IDENTIFIER'
+            elif kind == 'OP':
+                kind = _OPERATORS[lex]
+            elif kind == 'NUMBER':
+                # Точка или экспонента — FLOAT; длина INTEGER ограничена 16 цифрами
+                if not lex.isdigit():
+                    kind = 'FLOAT'
+                elif len(lex) > 16:
+                    kind = 'BAD'
                 else:
-                    break
-            if len(lex) > 256 or re.search(r'[а-яА-Я]', lex):
-                return Token('BAD', start_line, start_col, lex)
-            up = lex.upper()
-            if up in self.keywords:
-                return Token(up, start_line, start_col, lex)
-            return Token('IDENTIFIER', start_line, start_col, lex)
-
-        # Операторы и пунктуация
-        ch = self.get_char()
-        pc = self.peek_char()
-        # Двухсимвольные операторы
-        if ch == ':' and pc == '=':
-            return Token('ASSIGN', start_line, start_col, ch + self.get_char())
-        if ch == '<' and pc == '=':
-            return Token('LESS_EQ', start_line, start_col, ch + self.get_char())
-        if ch == '<' and pc == '>':
-            return Token('NOT_EQ', start_line, start_col, ch + self.get_char())
-        if ch == '<':
-            return Token('LESS', start_line, start_col, ch)
-        if ch == '>' and pc == '=':
-            return Token('GREATER_EQ', start_line, start_col, ch + self.get_char())
-        if ch == '>':
-            return Token('GREATER', start_line, start_col, ch)
-
-        single = {
-            '*': 'MULTIPLICATION', '+': 'PLUS', '-': 'MINUS',
-            ';': 'SEMICOLON', ',': 'COMMA', '(': 'LEFT_PAREN',
-            ')': 'RIGHT_PAREN', '[': 'LEFT_BRACKET', ']': 'RIGHT_BRACKET',
-            '=': 'EQ', ':': 'COLON'
-        }
-        if ch in single:
-            return Token(single[ch], start_line, start_col, ch)
-        if ch == '.':
-            return Token('DOT', start_line, start_col, ch)
-
-        return Token('BAD', start_line, start_col, ch)
+                    kind = 'INTEGER'
+            # Незакрытая строка
+            elif kind == 'STRING':
+                if len(lex) == 1 or lex[-1] != "'":
+                    kind = 'BAD'
+            yield kind, line, col, lex
+
+    def tokens(self):
+        # Генератор объектов Token
+        for kind, line, col, lex in self.scan():
+            yield Token(kind, line, col, lex)
+
+    def lines(self):
+        # Сразу готовые строки вывода (как str(Token)), без промежуточных объектов Token
+        for kind, line, col, lex in self.scan():
+            yield f'{kind} ({line}, {col}) "{lex}"'
+
+    def next_token(self) -> Token:
+        # Поштучная выдача поверх того же генератора
+        if self.stream is None:
+            self.stream = self.tokens()
+        return next(self.stream, None)
 
 
 def main():
@@ -213,12 +136,15 @@ def main():
 
     lexer = Lexer(sys.argv[1])
     with open(sys.argv[2], 'w', encoding='utf-8') as out:
-        while True:
-            token = lexer.next_token()
-            if not token:
-                break
-            out.write(str(token) + "\n")
-    lexer.close()
+        # Строки токенов пишутся пачками, а не по одной
+        buf = []
+        for line in lexer.lines():
+            buf.append(line)
+            if len(buf) == 4096:
+                out.write('\n'.join(buf) + '\n')
+                buf.clear()
+        if buf:
+            out.write('\n'.join(buf) + '\n')
 
 if __name__ == '__main__':
     main()